@@ -1,4 +1,7 @@
 import streamlit as st
+from urllib.parse import urlencode
+
+from components import squad_selector
 
 st.set_page_config(page_title="Performance & Wellness Hub", page_icon="💡", layout="wide")
 
@@ -48,12 +51,19 @@ st.markdown("""
     cursor: pointer;
 }
 </style>
+""", unsafe_allow_html=True)
+
+# Selector de plantilla: cada sesión carga solo los datos de su plantilla
+squad = squad_selector()
+query = urlencode({"squad": squad})
 
+st.markdown(f"""
 <div class="grid-container">
-    <a class="grid-button" href="./Wellness">📊 Wellness Dashboard</a>
-    <a class="grid-button" href="./Procedures">💆‍♂️ Physiotherapy Procedures</a>
-    <a class="grid-button" href="./Calendar">📅 Individual Activity Calendar</a>
-    <a class="grid-button" href="./Weight_and_Fat">⚖️ Weight & Fat Tracking</a>
+    <a class="grid-button" href="./Wellness?{query}">📊 Wellness Dashboard</a>
+    <a class="grid-button" href="./Procedures?{query}">💆‍♂️ Physiotherapy Procedures</a>
+    <a class="grid-button" href="./Calendar?{query}">📅 Individual Activity Calendar</a>
+    <a class="grid-button" href="./Weight_and_Fat?{query}">⚖️ Weight & Fat Tracking</a>
+    <a class="grid-button" href="./Analytics?{query}">🔬 Cross-Source Analytics</a>
 </div>
 """, unsafe_allow_html=True)
 
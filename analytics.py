@@ -0,0 +1,231 @@
+"""Motor de análisis cruzado: matriz densa jugador × día × variable y correlaciones con desfase."""
+import functools
+import warnings
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+import data_api
+from body_regions import parse_pain
+
+SOURCES = ("wellness", "procedures", "calendar", "weight_fat")
+
+WELLNESS_FEATURES = {
+    "FATIGUE": "FATIGUE",
+    "SLEEP QUALITY": "SLEEP QUALITY",
+    "MUSCLE DISCOMFORT": "MUSCLE DISCOMFORT",
+    "MOOD": "MOOD",
+    "RECOVERY": "HOW HAVE YOU RECOVERED?",
+}
+FEATURES = list(WELLNESS_FEATURES) + ["Short sleep", "Pain areas", "Procedures", "Workouts", "Weight", "%Fat"]
+
+SHORT_SLEEP = ["1-5", "5-7"]
+
+# Mínimo de pares jugador-día para dar una correlación
+MIN_PAIRS = 10
+
+
+@dataclass
+class FeatureMatrix:
+    values: np.ndarray  # (jugadores, días, variables), NaN = sin dato
+    players: list
+    days: pd.DatetimeIndex
+    features: list
+    _cache: dict = field(default_factory=dict, repr=False)
+
+    def feature_index(self, name):
+        return self.features.index(name)
+
+
+# ===============================
+# Construcción de la matriz
+# ===============================
+def _scatter(values, players, start, frame, columns):
+    # frame: índice (jugador, fecha) agregado a un valor por día
+    p = pd.Index(players).get_indexer(frame.index.get_level_values(0))
+    d = (pd.to_datetime(frame.index.get_level_values(1)) - start).days.to_numpy()
+    f = [FEATURES.index(col) for col in columns]
+    values[p[:, None], d[:, None], f] = frame[columns].to_numpy(dtype=float)
+
+
+def _with_player(df, column):
+    # Los loaders hacen astype(str): las celdas vacías llegan como "nan"
+    player = df[column].astype(str).str.strip()
+    valid = df[column].notna() & ~player.str.lower().isin(["", "nan", "none"])
+    return df[valid].assign(Player=player[valid])
+
+
+def build_matrix(wellness, procedures, calendar, weight_fat, pain=None):
+    """Une las cuatro fuentes en una matriz densa jugador × día × FEATURES."""
+    # Normalizar columnas jugador/fecha de cada fuente (sin filas sin jugador)
+    wellness = _with_player(wellness, "Name")
+    procedures = _with_player(procedures, "PLAYER").assign(Date=lambda df: df["DATE"])
+    calendar = _with_player(calendar, "Player")
+    weight_fat = _with_player(weight_fat, "Player")
+    frames = [wellness, procedures, calendar, weight_fat]
+
+    players = sorted(set().union(*[set(df["Player"]) for df in frames]))
+    all_dates = pd.to_datetime(pd.concat([df["Date"] for df in frames]).dropna())
+    if not players or all_dates.empty:
+        return FeatureMatrix(np.empty((0, 0, len(FEATURES))), [], pd.DatetimeIndex([]), list(FEATURES))
+    days = pd.date_range(all_dates.min(), all_dates.max(), freq="D")
+    start = days[0]
+
+    values = np.full((len(players), len(days), len(FEATURES)), np.nan)
+
+    # Conteos: 0 cuando no hay registros
+    for name in ["Procedures", "Workouts"]:
+        values[:, :, FEATURES.index(name)] = 0.0
+
+    # Wellness: media diaria de cada puntuación
+    daily = wellness.rename(columns={col: name for name, col in WELLNESS_FEATURES.items()})
+    daily["Short sleep"] = daily["HOW MANY HOURS YOU SLEEP?"].isin(SHORT_SLEEP).astype(float)
+    daily.loc[daily["HOW MANY HOURS YOU SLEEP?"].isna(), "Short sleep"] = np.nan
+    daily["Pain areas"] = 0.0
+    daily = daily.groupby(["Player", "Date"])[list(WELLNESS_FEATURES) + ["Short sleep", "Pain areas"]].mean()
+    _scatter(values, players, start, daily, list(daily.columns))
+
+    # Zonas con molestias: 0 los días con respuesta, número de zonas si las hay
+    if pain is not None and not pain.empty:
+        # parse_pain trabaja sobre el snapshot sin limpiar: mismo filtro de jugador que wellness
+        pain_daily = _with_player(pain.reset_index(), "Name")
+        pain_daily = pain_daily.groupby(["Player", "Date"]).size().rename("Pain areas").to_frame()
+        _scatter(values, players, start, pain_daily, ["Pain areas"])
+
+    counts = procedures.groupby(["Player", "Date"]).size().rename("Procedures").to_frame()
+    _scatter(values, players, start, counts, ["Procedures"])
+
+    counts = calendar.groupby(["Player", "Date"]).size().rename("Workouts").to_frame()
+    _scatter(values, players, start, counts, ["Workouts"])
+
+    weight = weight_fat.groupby(["Player", "Date"])[["Weight"]].mean()
+    _scatter(values, players, start, weight, ["Weight"])
+
+    # %Fat solo en los días de medición real: el valor alineado puede venir de días
+    # posteriores y metería información futura en las correlaciones con desfase
+    measured = weight_fat[weight_fat["Date"] == weight_fat["Fat Date"]]
+    fat = measured.groupby(["Player", "Date"])[["%Fat"]].mean()
+    _scatter(values, players, start, fat, ["%Fat"])
+
+    return FeatureMatrix(values, players, days, list(FEATURES))
+
+
+@functools.lru_cache(maxsize=None)
+def _builder(squad):
+    # Una función por plantilla: data_api.derived usa la función como parte de la clave
+    def build(wellness, procedures, calendar, weight_fat):
+        pain = data_api.derived("wellness", parse_pain, squad=squad)
+        return build_matrix(wellness, procedures, calendar, weight_fat, pain)
+
+    return build
+
+
+def feature_matrix(squad=None):
+    """Matriz del snapshot actual de `squad`; se reconstruye solo cuando alguna fuente se refresca."""
+    squad = squad or data_api.DEFAULT_SQUAD
+    return data_api.derived(SOURCES, _builder(squad), squad=squad)
+
+
+# ===============================
+# Correlaciones (vectorizadas)
+# ===============================
+def _window_mean(values, window):
+    # Media (ignorando NaN) de los días [t, t + window) para cada t válido
+    mask = ~np.isnan(values)
+    zeros = np.zeros(values.shape[:1] + (1,) + values.shape[2:])
+    total = np.concatenate([zeros, np.cumsum(np.where(mask, values, 0.0), axis=1)], axis=1)
+    count = np.concatenate([zeros, np.cumsum(mask, axis=1)], axis=1)
+    total = total[:, window:] - total[:, :-window]
+    count = count[:, window:] - count[:, :-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _pairwise_corr(x, y):
+    # Pearson por pares de variables usando solo observaciones completas.
+    # x, y: (..., N, F); se reduce sobre N y devuelve r y n con forma (..., F, F)
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = np.where(mx, x, 0.0), np.where(my, y, 0.0)
+    mx, my = mx.astype(float), my.astype(float)
+
+    def dot(a, b):
+        return np.einsum("...ni,...nj->...ij", a, b)
+
+    n = dot(mx, my)
+    sx, sy = dot(x0, my), dot(mx, y0)
+    sxx, syy = dot(x0 ** 2, my), dot(mx, y0 ** 2)
+    sxy = dot(x0, y0)
+
+    cov = n * sxy - sx * sy
+    var = (n * sxx - sx ** 2) * (n * syy - sy ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = cov / np.sqrt(var)
+    r[(n < MIN_PAIRS) | ~(var > 0)] = np.nan
+    return r, n
+
+
+def _day_slice(fm, start, end):
+    first = fm.days.searchsorted(pd.Timestamp(start)) if start is not None else 0
+    last = fm.days.searchsorted(pd.Timestamp(end), side="right") if end is not None else len(fm.days)
+    return slice(first, last)
+
+
+def _lag_pairs(values, window_means, lag, window):
+    # X[t] frente a la media de Y en [t + lag, t + lag + window)
+    length = values.shape[1] - lag - window + 1
+    if length <= 0:
+        return None, None
+    return values[:, :length, :], window_means[:, lag:lag + length, :]
+
+
+def lagged_correlations(fm, max_lag, window=1, start=None, end=None):
+    """Correlación de cada variable X (día t) con cada Y (media de t+lag … t+lag+window-1).
+
+    Agrupa todos los jugadores. Devuelve r y n con forma (max_lag + 1, F, F): r[lag, x, y].
+    Se calcula una vez por matriz y combinación de parámetros.
+    """
+    key = ("lagged", max_lag, window, start, end)
+    if key not in fm._cache:
+        values = fm.values[:, _day_slice(fm, start, end), :]
+        n_features = len(fm.features)
+        r = np.full((max_lag + 1, n_features, n_features), np.nan)
+        n = np.zeros((max_lag + 1, n_features, n_features))
+        window_means = _window_mean(values, window)
+        for lag in range(max_lag + 1):
+            x, y = _lag_pairs(values, window_means, lag, window)
+            if x is None:
+                break
+            r[lag], n[lag] = _pairwise_corr(x.reshape(-1, n_features), y.reshape(-1, n_features))
+        fm._cache[key] = (r, n)
+    return fm._cache[key]
+
+
+def player_correlations(fm, lag, window=1, start=None, end=None):
+    """Igual que `lagged_correlations` para un solo desfase, pero por jugador: (P, F, F)."""
+    key = ("player", lag, window, start, end)
+    if key not in fm._cache:
+        values = fm.values[:, _day_slice(fm, start, end), :]
+        n_features = len(fm.features)
+        x, y = _lag_pairs(values, _window_mean(values, window), lag, window)
+        if x is None:
+            shape = (len(fm.players), n_features, n_features)
+            fm._cache[key] = (np.full(shape, np.nan), np.zeros(shape))
+        else:
+            fm._cache[key] = _pairwise_corr(x, y)
+    return fm._cache[key]
+
+
+def player_summary(fm, start=None, end=None):
+    """Media por jugador de cada variable (total para Procedures y Workouts)."""
+    key = ("summary", start, end)
+    if key not in fm._cache:
+        values = fm.values[:, _day_slice(fm, start, end), :]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # jugadores sin datos en una variable
+            means = np.nanmean(values, axis=1)
+        summary = pd.DataFrame(means, index=pd.Index(fm.players, name="Player"), columns=fm.features)
+        for name in ["Procedures", "Workouts"]:
+            summary[name] = values[:, :, fm.feature_index(name)].sum(axis=1)
+        fm._cache[key] = summary
+    return fm._cache[key]
@@ -0,0 +1,54 @@
+"""Modelo de composición corporal: peso alineado con el % de grasa más cercano."""
+import pandas as pd
+
+FAT_THRESHOLD = 11.5
+
+# Distancia máxima entre un peso y la medición de grasa que se le asigna
+FAT_ASOF_TOLERANCE = pd.Timedelta(days=30)
+
+
+def align_weight_fat(weight_df, fat_df):
+    """Une cada (Player, Date) con el peso del día y la medición de grasa más cercana.
+
+    Devuelve Player, Date, Weight, %Fat y "Fat Date" (fecha real de la medición de grasa).
+    Las mediciones de grasa repetidas el mismo día se promedian antes de alinear, así
+    cada fila con Date == Fat Date representa todas las lecturas de ese día.
+    """
+    weight_df = weight_df[["Player", "Date", "Weight"]].dropna(subset=["Player", "Date"])
+    fat_df = fat_df[["Player", "Date", "%Fat"]].dropna(subset=["Player", "Date", "%Fat"])
+    # Varias mediciones el mismo día: se usa su media (una sola medición por día y jugador)
+    fat_df = fat_df.groupby(["Player", "Date"], as_index=False)["%Fat"].mean()
+
+    # Todas las fechas con peso o grasa, con el peso exacto de ese día
+    keys = pd.concat([weight_df[["Player", "Date"]], fat_df[["Player", "Date"]]]).drop_duplicates()
+    base = keys.merge(weight_df, on=["Player", "Date"], how="left")
+    base["_t"] = pd.to_datetime(base["Date"])
+
+    fat = fat_df.rename(columns={"Date": "Fat Date"})
+    fat["_t"] = pd.to_datetime(fat["Fat Date"])
+
+    aligned = pd.merge_asof(
+        base.sort_values("_t"),
+        fat.sort_values("_t"),
+        on="_t",
+        by="Player",
+        direction="nearest",
+        tolerance=FAT_ASOF_TOLERANCE,
+    )
+    aligned = aligned.drop(columns="_t")
+    return aligned.sort_values(by=["Player", "Date"]).reset_index(drop=True)
+
+
+def summarize(aligned):
+    """Último peso, última/mejor grasa y alerta > FAT_THRESHOLD por jugador (índice: Player)."""
+    weights = aligned.dropna(subset=["Weight"]).sort_values("Date")
+    latest_weight = weights.drop_duplicates("Player", keep="last").set_index("Player")[["Date", "Weight"]]
+
+    # Mediciones reales de grasa: filas cuya fecha coincide con la de la medición asignada
+    fat = aligned[aligned["Date"] == aligned["Fat Date"]].sort_values("Date")
+    latest_fat = fat.drop_duplicates("Player", keep="last").set_index("Player")[["Fat Date", "%Fat"]]
+    best_fat = fat.groupby("Player")["%Fat"].min().rename("Best %Fat")
+
+    summary = latest_weight.join([latest_fat, best_fat], how="outer")
+    summary[f"Over {FAT_THRESHOLD}%"] = summary["%Fat"] > FAT_THRESHOLD
+    return summary.sort_index()
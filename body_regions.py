@@ -0,0 +1,165 @@
+"""Vocabulario de regiones corporales, parser de molestias musculares y mapa corporal."""
+import pandas as pd
+from matplotlib.figure import Figure
+from PIL import Image
+
+PAIN_COL = "IF THE PREVIOUS ANSWER IS 1 OR 2. WHERE (LOW = L / MEDIUM = M /HIGH = H)"
+
+# Diccionario de coordenadas ajustado (2 cm ≈ +25 px de desplazamiento horizontal)
+REGION_COORDS = {
+    # Vista trasera (izquierda)
+    "Right Adductor": (115, 270),
+    "Left Adductor": (90, 270),
+    "Right biceps femoris": (120, 300),
+    "Left biceps femoris": (70, 300),
+    "Lower back": (95, 215),
+
+    # Vista frontal (derecha)
+    "Abdomen": (308, 210),
+    "Left Knee": (325, 335),
+    "Right anterior rectum": (290, 275),
+    "Left anterior rectum": (318, 275),
+    "Right ankle": (290, 430),
+    "Left ankle": (320, 430),
+}
+
+# Sinónimos habituales en las respuestas -> nombre de la región (sin lado)
+REGION_ALIASES = {
+    "adductors": "adductor",
+    "groin": "adductor",
+    "hamstring": "biceps femoris",
+    "hamstrings": "biceps femoris",
+    "biceps": "biceps femoris",
+    "quad": "anterior rectum",
+    "quads": "anterior rectum",
+    "quadriceps": "anterior rectum",
+    "rectus femoris": "anterior rectum",
+    "back": "lower back",
+    "lumbar": "lower back",
+    "low back": "lower back",
+    "abs": "abdomen",
+    "abdominal": "abdomen",
+    "knees": "knee",
+    "ankles": "ankle",
+}
+
+# "?" = respuesta sin severidad: color neutro, nunca el de H
+UNKNOWN_SEVERITY = "?"
+SEVERITY_ORDER = [UNKNOWN_SEVERITY, "L", "M", "H"]
+SEVERITY_COLORS = {UNKNOWN_SEVERITY: "grey", "L": "gold", "M": "orange", "H": "red"}
+
+_VOCABULARY = {name.lower(): name for name in REGION_COORDS}
+
+# Token de severidad; "low back" es una zona, no severidad baja
+_SEVERITY = r"\b(low(?!\s+back)|medium|med|high|l|m|h)\b"
+
+
+# ===============================
+# Parser de molestias (vectorizado)
+# ===============================
+def parse_pain(df, player_col="Name", date_col="Date"):
+    """Convierte la respuesta libre de molestias en una tabla larga Name/Date/Region/Severity.
+
+    Acepta varias zonas separadas por comas, ';', '/', '+', 'and' o 'y', con la severidad
+    (L/M/H o Low/Medium/High) antes o después de la zona; si hay varias se usa la última.
+    Una "L"/"R" justo delante de la zona se lee como lado ("low back" es zona, no severidad).
+    Índice: (Name, Date), ordenado.
+    `Mapped` indica si la región existe en REGION_COORDS.
+    """
+    answers = df.loc[df[PAIN_COL].notna(), [player_col, date_col, PAIN_COL]]
+    answers = answers.rename(columns={player_col: "Name", date_col: "Date", PAIN_COL: "Raw"})
+
+    # Una fila por zona
+    answers["Raw"] = answers["Raw"].astype(str).str.split(r"(?i)[,;/+\n]|\band\b|\by\b", regex=True)
+    parts = answers.explode("Raw")
+    parts["Raw"] = parts["Raw"].str.strip()
+
+    # "L adductor": con un solo token L/M/H, una "L" delante de la zona es el lado, no la severidad
+    raw = parts["Raw"]
+    side_first = (raw.str.count("(?i)" + _SEVERITY) == 1) & raw.str.contains(r"(?i)^l\s+[a-záéíóúñ]", regex=True)
+    raw = raw.mask(side_first, raw.str.replace(r"(?i)^l\s+", "left ", regex=True))
+
+    # Severidad: el último token L/M/H (el primero puede ser el lado, "L hamstring M")
+    severity = raw.str.extract(rf"(?i)^(.*){_SEVERITY}(.*)$")
+    parts["Severity"] = severity[1].str[0].str.upper()
+    rest = (severity[0] + " " + severity[2]).fillna(raw)
+
+    # Texto de la zona: sin severidad, sin paréntesis/guiones y en minúsculas
+    text = (
+        rest
+        .str.lower()
+        .str.replace(r"[^a-záéíóúñ ]", " ", regex=True)
+        .str.split()
+        .str.join(" ")
+    )
+    # "L"/"R" delante de la zona es el lado
+    text = text.str.replace(r"^l (?=[a-z])", "left ", regex=True).str.replace(r"^r (?=[a-z])", "right ", regex=True)
+
+    # El lado puede venir antes o después ("adductor right"): se normaliza delante
+    side = text.str.extract(r"\b(right|left)\b")[0]
+    base = text.str.replace(r"\b(right|left)\b", " ", regex=True).str.split().str.join(" ")
+    base = base.replace(REGION_ALIASES)
+    key = (side.fillna("") + " " + base).str.strip()
+
+    parts["Region"] = key.map(_VOCABULARY)
+    parts["Mapped"] = parts["Region"].notna()
+    parts["Region"] = parts["Region"].fillna(key.str.capitalize())
+
+    parts = parts[parts["Region"] != ""]
+    pain = parts[["Name", "Date", "Region", "Severity", "Mapped", "Raw"]]
+    return pain.set_index(["Name", "Date"]).sort_index()
+
+
+def select_pain(pain, start, end, player=None):
+    """Filas del índice de molestias en [start, end], opcionalmente de un solo jugador."""
+    if player is not None and player != "All":
+        if player not in pain.index.get_level_values("Name"):
+            return pain.iloc[0:0]
+        pain = pain.loc[[player]]
+    return pain.loc[(slice(None), slice(start, end)), :]
+
+
+def region_severity_counts(pain):
+    """Tabla región × severidad (?/L/M/H) con el número de respuestas; "?" = sin severidad."""
+    severity = pain["Severity"].fillna(UNKNOWN_SEVERITY)
+    counts = pain.assign(Severity=severity).groupby(["Region", "Severity"]).size().unstack(fill_value=0)
+    return counts.reindex(columns=SEVERITY_ORDER, fill_value=0)
+
+
+def severity_colors(pain):
+    """Color por región según la severidad más alta reportada."""
+    counts = region_severity_counts(pain)
+    worst = counts.gt(0).iloc[:, ::-1].idxmax(axis=1)
+    return worst.map(SEVERITY_COLORS)
+
+
+# ===============================
+# 🧍 Mapa corporal
+# ===============================
+def draw_body_map(region_counts, colors="red"):
+    """Dibuja círculos proporcionales a `region_counts` sobre assets/body_map.png.
+
+    `colors` es un color único o una Serie región -> color.
+    """
+    body_img = Image.open("assets/body_map.png")
+
+    # Figure en vez de plt.subplots: no queda registrada en pyplot y se libera sola tras cada rerun
+    fig = Figure(figsize=(4, 6))
+    ax = fig.subplots()
+    ax.imshow(body_img)
+    ax.axis("off")
+
+    # Normalizar tamaño del círculo
+    max_count = region_counts.max() if not region_counts.empty else 1
+
+    # Pintar solo regiones con conteo > 0
+    for region, count in region_counts.items():
+        if region in REGION_COORDS:
+            x, y = REGION_COORDS[region]
+            color = colors.get(region, SEVERITY_COLORS[UNKNOWN_SEVERITY]) if isinstance(colors, pd.Series) else colors
+            size = 80 + 200 * (count / max_count)  # Mucho más pequeño
+            ax.scatter(x, y, s=size, c=color, alpha=0.5, edgecolors="black", linewidths=0.5)
+            ax.text(x, y, str(count), fontsize=6, ha="center", va="center", color="white", weight="bold")
+            ax.text(x, y + 12, region, fontsize=5.5, ha="center", va="top", color="black")
+
+    return fig
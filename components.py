@@ -0,0 +1,94 @@
+"""Componentes de interfaz compartidos por las páginas del Hub."""
+import math
+
+import numpy as np
+import streamlit as st
+
+import data_api
+
+DEFAULT_ORDER = "(default)"
+
+
+# ===============================
+# 👥 Plantilla activa
+# ===============================
+def current_squad():
+    """Plantilla de la sesión: ?squad=... en la URL, la elegida en el Hub o la por defecto.
+
+    Todas las páginas pasan por aquí, así que también arranca el servicio HTTP de data_api
+    dentro del proceso del Hub (una sola vez), para que comparta la caché con las páginas.
+    """
+    data_api.start_server()
+    squad = st.query_params.get("squad")
+    if squad in data_api.SQUADS:
+        st.session_state["squad"] = squad
+    return st.session_state.get("squad", data_api.DEFAULT_SQUAD)
+
+
+def squad_selector():
+    """Selector de plantilla; guarda la elección en la sesión y en la URL."""
+    squads = data_api.squads()
+    squad = st.selectbox("👥 Squad", squads, index=squads.index(current_squad()))
+    st.session_state["squad"] = squad
+    st.query_params["squad"] = squad
+    return squad
+
+
+# ===============================
+# 📋 Tabla paginada en servidor
+# ===============================
+def search_and_sort(df, search="", sort_col=DEFAULT_ORDER, descending=False):
+    """Filas de `df` que contienen `search` y su orden, como posiciones dentro del resultado."""
+    # Búsqueda: solo sobre columnas de texto, sin distinguir mayúsculas
+    view = df
+    if search:
+        text_cols = df.select_dtypes(include=["object", "string"]).columns
+        mask = np.zeros(len(df.index), dtype=bool)
+        for col in text_cols:
+            mask |= df[col].astype(str).str.contains(search, case=False, regex=False, na=False).to_numpy()
+        view = df.iloc[mask]
+
+    # Orden: se ordena solo la columna elegida (por posición, el índice puede repetirse)
+    if sort_col != DEFAULT_ORDER:
+        keys = view[sort_col].reset_index(drop=True)
+        order = keys.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+    else:
+        order = np.arange(len(view.index))
+        if descending:
+            order = order[::-1]
+    return view, order
+
+
+def paged_table(df, key, page_size=25):
+    """Muestra `df` con búsqueda, orden y paginación resueltos en el servidor.
+
+    Solo la página visible se envía al navegador. `key` debe ser único en la página.
+    """
+    total_rows = len(df.index)
+
+    col_search, col_sort, col_desc = st.columns([3, 2, 1])
+    search = col_search.text_input("🔍 Search", key=f"{key}_search")
+    sort_col = col_sort.selectbox("Sort by", [DEFAULT_ORDER] + list(df.columns), key=f"{key}_sort")
+    descending = col_desc.toggle("Descending", key=f"{key}_desc")
+
+    view, order = search_and_sort(df, search, sort_col, descending)
+
+    rows = len(view.index)
+    if rows == 0:
+        st.write("No rows match the search.")
+        return
+
+    n_pages = max(1, math.ceil(rows / page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    first = (page - 1) * page_size
+    last = min(first + page_size, rows)
+    st.dataframe(view.iloc[order[first:last]], use_container_width=True, hide_index=True)
+
+    caption = f"Rows {first + 1}–{last} of {rows}"
+    if rows != total_rows:
+        caption += f" (filtered from {total_rows})"
+    st.caption(caption)
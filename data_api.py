@@ -0,0 +1,413 @@
+"""Snapshots limpios y cacheados de las hojas del Hub.
+
+Las páginas de Streamlit y cualquier otra herramienta (GPS, médicos...) leen
+de aquí, así Google Sheets se descarga una sola vez por refresco.
+
+Las URLs (o ficheros CSV locales) de cada plantilla están en squads.json
+(o en el fichero indicado por HUB_SQUADS_FILE). Cada plantilla se descarga y
+cachea por separado, solo cuando alguien la pide, y se libera cuando lleva un
+TTL sin usarse.
+
+Uso como librería:
+
+    import data_api
+    df = data_api.query("wellness", players=["John Doe"], start=..., end=..., squad="Academy")
+
+Uso como servicio local (solo lectura):
+
+    GET http://127.0.0.1:8765/wellness?squad=Academy&player=John%20Doe&start=2025-01-01&end=2025-01-31&format=arrow
+
+El modo soportado es el servicio dentro del Hub: cada página llama a start_server()
+(vía components.current_squad) y el servidor corre en un hilo del mismo proceso de
+Streamlit, así el Hub y las herramientas externas comparten la misma caché.
+HUB_API_HOST / HUB_API_PORT cambian la dirección (HUB_API_PORT=0 lo desactiva).
+
+`python data_api.py --port 8765` arranca el servicio solo, con su propia caché:
+útil únicamente cuando el Hub no está en marcha.
+"""
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import body_composition
+
+# ===============================
+# Registro de plantillas
+# ===============================
+REGISTRY_PATH = os.environ.get(
+    "HUB_SQUADS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "squads.json")
+)
+
+
+def _load_registry(path):
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    # Rutas locales relativas al fichero de configuración; las URLs se dejan igual
+    base = os.path.dirname(os.path.abspath(path))
+    squads = {
+        name: {key: value if "://" in value else os.path.join(base, value) for key, value in files.items()}
+        for name, files in config["squads"].items()
+    }
+    return config.get("default", next(iter(squads))), squads
+
+
+DEFAULT_SQUAD, SQUADS = _load_registry(REGISTRY_PATH)
+
+
+# ===============================
+# Limpieza por fuente
+# ===============================
+def _load_wellness(files):
+    df = pd.read_csv(files["wellness"])
+
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
+    df = df.dropna(subset=['Timestamp'])
+    df['Date'] = df['Timestamp'].dt.date
+
+    vars_1to5 = ["FATIGUE", "SLEEP QUALITY", "MUSCLE DISCOMFORT", "MOOD"]
+    var_recovery = "HOW HAVE YOU RECOVERED?"
+
+    for var in vars_1to5:
+        df[var] = df[var].astype(str).str.extract(r'(\d)').astype(float)
+    df[var_recovery] = pd.to_numeric(df[var_recovery], errors='coerce')
+
+    return df
+
+
+def _load_procedures(files):
+    df = pd.read_csv(files["procedures"])
+    df.columns = [col.strip() for col in df.columns]
+    df["DATE"] = pd.to_datetime(df["DATE"], dayfirst=True, errors="coerce").dt.date
+    df = df.dropna(subset=["DATE"])
+    df["PLAYER"] = df["PLAYER"].astype(str)
+    return df
+
+
+def _load_calendar(files):
+    df = pd.read_csv(files["calendar"])
+    df["Date"] = pd.to_datetime(df["Date"], dayfirst=True, errors="coerce").dt.date
+    df.dropna(subset=["Date"], inplace=True)
+    df["Player"] = df["Player"].astype(str).str.split(", ")
+    df = df.explode("Player")
+    df["Workout"] = df["Workout"].str.strip()
+    return df
+
+
+def _to_float(series):
+    return (
+        series
+        .astype(str)
+        .str.replace(",", ".", regex=False)
+        .str.extract(r'(\d+\.?\d*)')[0]
+        .astype(float)
+    )
+
+
+def _load_weight_fat(files):
+    # Peso
+    weight_df = pd.read_csv(files["weight"])
+    weight_df.columns = [col.strip() for col in weight_df.columns]
+    weight_df = weight_df.rename(columns={"Player_name": "Player"})
+    weight_df["Date"] = pd.to_datetime(weight_df["Date"], dayfirst=True, errors="coerce").dt.date
+    weight_df["Weight"] = _to_float(weight_df["Weight"])
+
+    # Grasa
+    fat_df = pd.read_csv(files["fat"])
+    fat_df.columns = [col.strip() for col in fat_df.columns]
+    fat_df = fat_df.rename(columns={"Full_Name": "Player", "Faulker": "%Fat"})
+    fat_df["Date"] = pd.to_datetime(fat_df["Date"], dayfirst=True, errors="coerce").dt.date
+    fat_df["%Fat"] = _to_float(fat_df["%Fat"])
+
+    # Cada peso con la medición de grasa más cercana (ver body_composition.py)
+    return body_composition.align_weight_fat(weight_df, fat_df)
+
+
+# Cada fuente: loader, columnas de jugador/fecha para los filtros y TTL (segundos)
+SOURCES = {
+    "wellness": {"load": _load_wellness, "player": "Name", "date": "Date", "ttl": 300},
+    "procedures": {"load": _load_procedures, "player": "PLAYER", "date": "DATE", "ttl": 300},
+    "calendar": {"load": _load_calendar, "player": "Player", "date": "Date", "ttl": 600},
+    "weight_fat": {"load": _load_weight_fat, "player": "Player", "date": "Date", "ttl": 600},
+}
+
+
+# ===============================
+# Caché de snapshots
+# ===============================
+_snapshots = {}  # (plantilla, fuente) -> (momento de descarga, DataFrame)
+_last_used = {}  # (plantilla, fuente) -> último acceso
+_derived = {}  # (plantilla, fuentes, función) -> (momentos de descarga de los snapshots, resultado)
+_locks = {}  # (plantilla, fuente) -> Lock
+_registry_lock = threading.Lock()
+_sweeper = None
+
+# Cada cuánto se revisan los snapshots sin uso (segundos)
+SWEEP_INTERVAL = 60
+
+# Dirección del servicio HTTP que arranca el Hub
+API_HOST = os.environ.get("HUB_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("HUB_API_PORT", "8765"))
+_server = None
+
+
+def squads():
+    return list(SQUADS)
+
+
+def _check_source(source):
+    if source not in SOURCES:
+        raise KeyError(f"Unknown source '{source}'. Available: {', '.join(SOURCES)}")
+
+
+def _check_squad(squad):
+    squad = squad or DEFAULT_SQUAD
+    if squad not in SQUADS:
+        raise KeyError(f"Unknown squad '{squad}'. Available: {', '.join(SQUADS)}")
+    return squad
+
+
+def _lock(key):
+    with _registry_lock:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _evict_idle():
+    # Liberar los snapshots que nadie ha usado durante su TTL: la memoria crece
+    # con las plantillas activas, no con todas las registradas
+    now = time.monotonic()
+    with _registry_lock:
+        idle = {key for key, used in list(_last_used.items()) if now - used > SOURCES[key[1]]["ttl"]}
+        for key in idle:
+            _snapshots.pop(key, None)
+            _last_used.pop(key, None)
+        for key in [k for k in list(_derived) if any((k[0], name) in idle for name in k[1])]:
+            _derived.pop(key, None)
+
+
+def _sweep_forever():
+    while True:
+        time.sleep(SWEEP_INTERVAL)
+        _evict_idle()
+
+
+def _start_sweeper():
+    # Hilo en segundo plano: una plantilla inactiva se libera aunque no llegue otra petición
+    global _sweeper
+    with _registry_lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_forever, name="data_api-sweeper", daemon=True)
+            _sweeper.start()
+
+
+def _cached(source, squad):
+    _check_source(source)
+    squad = _check_squad(squad)
+    _start_sweeper()
+    key = (squad, source)
+    with _lock(key):
+        now = time.monotonic()
+        _last_used[key] = now
+        cached = _snapshots.get(key)
+        # Se vuelve a descargar cuando el snapshot supera su TTL desde la descarga
+        if cached is None or now - cached[0] > SOURCES[source]["ttl"]:
+            cached = (now, SOURCES[source]["load"](SQUADS[squad]))
+            _snapshots[key] = cached
+    return cached
+
+
+def get_snapshot(source, squad=None):
+    """Devuelve el DataFrame limpio de `source` para `squad` (por defecto DEFAULT_SQUAD).
+
+    Se descarga solo si no está en caché o caducó. El mismo objeto se comparte entre
+    todos los consumidores: tratarlo como solo lectura (usar `.copy()` antes de modificarlo).
+    """
+    return _cached(source, squad)[1]
+
+
+def derived(source, fn, squad=None):
+    """Devuelve `fn(snapshot)`, calculado una sola vez por snapshot de `source`.
+
+    `source` puede ser una tupla de fuentes: entonces se llama `fn(*snapshots)` y se
+    recalcula en cuanto cualquiera de ellas se refresca.
+    """
+    squad = _check_squad(squad)
+    sources = (source,) if isinstance(source, str) else tuple(source)
+    cached = [_cached(name, squad) for name in sources]
+    version = tuple(c[0] for c in cached)
+    key = (squad, sources, fn)
+    result = _derived.get(key)
+    if result is None or result[0] != version:
+        result = (version, fn(*[c[1] for c in cached]))
+        _derived[key] = result
+    return result[1]
+
+
+def refresh(source=None, squad=None):
+    """Invalida el snapshot de `source` (o de todas las fuentes) de `squad` (o de todas)."""
+    for name in [source] if source else list(SOURCES):
+        _check_source(name)
+        for squad_name in [_check_squad(squad)] if squad else list(SQUADS):
+            with _lock((squad_name, name)):
+                _snapshots.pop((squad_name, name), None)
+                _last_used.pop((squad_name, name), None)
+    with _registry_lock:
+        for key in [k for k in list(_derived) if (not squad or k[0] == squad) and (not source or source in k[1])]:
+            _derived.pop(key, None)
+
+
+def query(source, players=None, start=None, end=None, squad=None):
+    """Filtra el snapshot de `source` por jugador(es) y rango de fechas (incluido)."""
+    df = get_snapshot(source, squad)
+    spec = SOURCES[source]
+    mask = pd.Series(True, index=df.index)
+    if players:
+        mask &= df[spec["player"]].isin(players)
+    if start is not None:
+        mask &= df[spec["date"]] >= start
+    if end is not None:
+        mask &= df[spec["date"]] <= end
+    return df[mask]
+
+
+# ===============================
+# Serialización
+# ===============================
+def _is_date(value):
+    return isinstance(value, datetime.date) and not isinstance(value, datetime.datetime)
+
+
+def _date_columns(df):
+    # Columnas object cuyos valores son todos datetime.date (Date, DATE, Fat Date...)
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].dropna()
+        if len(values) and _is_date(values.iloc[0]) and values.map(_is_date).all():
+            yield col
+
+
+def to_json(df):
+    # Fechas sin hora como YYYY-MM-DD (to_json las convertiría en "...T00:00:00.000")
+    dates = {col: df[col].map(datetime.date.isoformat, na_action="ignore") for col in _date_columns(df)}
+    return df.assign(**dates).to_json(orient="records", date_format="iso", force_ascii=False)
+
+
+def to_arrow(df):
+    # pyarrow viene con Streamlit; se importa aquí para no cargarlo si no se usa
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+# ===============================
+# Servicio HTTP local
+# ===============================
+def _parse_date(value):
+    return datetime.date.fromisoformat(value) if value else None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _send(self, status, body, content_type):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}), "application/json")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        source = url.path.strip("/")
+        params = parse_qs(url.query)
+
+        if not source:
+            self._send(200, json.dumps({"sources": sorted(SOURCES), "squads": squads()}), "application/json")
+            return
+        if source not in SOURCES:
+            self._error(404, f"Unknown source '{source}'")
+            return
+
+        squad = params.get("squad", [DEFAULT_SQUAD])[0]
+        if squad not in SQUADS:
+            self._error(404, f"Unknown squad '{squad}'")
+            return
+
+        try:
+            start = _parse_date(params.get("start", [None])[0])
+            end = _parse_date(params.get("end", [None])[0])
+        except ValueError:
+            self._error(400, "Dates must be YYYY-MM-DD")
+            return
+
+        fmt = params.get("format", ["json"])[0]
+        if fmt not in ("json", "arrow"):
+            self._error(400, "format must be 'json' or 'arrow'")
+            return
+
+        # Errores de Google Sheets, de red o de columnas: JSON en vez de cortar la conexión
+        try:
+            df = query(source, players=params.get("player"), start=start, end=end, squad=squad)
+        except Exception as exc:
+            self._error(502, f"Could not load '{source}': {exc}")
+            return
+
+        if fmt == "arrow":
+            self._send(200, to_arrow(df), "application/vnd.apache.arrow.stream")
+        else:
+            self._send(200, to_json(df), "application/json")
+
+
+def start_server(host=None, port=None):
+    """Arranca (una sola vez) el servicio HTTP en un hilo de este proceso.
+
+    Devuelve el servidor, o None si está desactivado (puerto 0) o el puerto está ocupado.
+    """
+    global _server
+    host = API_HOST if host is None else host
+    port = API_PORT if port is None else port
+    if not port:
+        return None
+    with _registry_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _Handler)
+            except OSError as exc:
+                # Puerto ocupado (p. ej. otro Hub o `python data_api.py`): no se reintenta en cada rerun
+                print(f"data_api: HTTP service not started on {host}:{port}: {exc}")
+                _server = False
+                return None
+            threading.Thread(target=_server.serve_forever, name="data_api-http", daemon=True).start()
+    return _server or None
+
+
+def serve(host="127.0.0.1", port=8765):
+    server = ThreadingHTTPServer((host, port), _Handler)
+    print(f"Serving {', '.join(SOURCES)} for {', '.join(SQUADS)} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only API over the cleaned Hub datasets")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -0,0 +1,119 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+import analytics
+import data_api
+from components import current_squad
+
+st.set_page_config(layout="wide",page_icon="🔬")
+
+# Plantilla activa (elegida en el Hub)
+squad = current_squad()
+st.sidebar.caption(f"👥 Squad: {squad}")
+
+# Encabezado
+st.markdown("""
+    <div style="display: flex; align-items: center; margin-bottom: 10px;">
+        <img src="https://tmssl.akamaized.net//images/wappen/head/45457.png?lm=1534711579"
+             width="80"
+             style="margin-right: 15px; opacity: 0.6;">
+        <h1 style="margin: 0;">🔬 Cross-Source Analytics</h1>
+    </div>
+    """, unsafe_allow_html=True)
+
+# Botón para refrescar (todas las fuentes)
+if st.button("🔄 Refresh Data"):
+    data_api.refresh(squad=squad)
+
+# Matriz jugador × día × variable (se construye una vez por snapshot)
+fm = analytics.feature_matrix(squad)
+
+if not fm.players:
+    st.warning("No data available.")
+    st.stop()
+
+# ===============================
+# Filtros
+# ===============================
+st.sidebar.title("Filters")
+first_day, last_day = fm.days[0].date(), fm.days[-1].date()
+date_range = st.sidebar.date_input("Select Date Range", [first_day, last_day],
+                                   min_value=first_day, max_value=last_day)
+
+x_feature = st.sidebar.selectbox("Predictor (day t)", fm.features, index=fm.feature_index("Short sleep"))
+y_feature = st.sidebar.selectbox("Outcome", fm.features, index=fm.feature_index("Procedures"))
+max_lag = st.sidebar.slider("Max lag (days)", 1, 14, 7)
+window = st.sidebar.slider("Outcome window (days)", 1, 7, 2,
+                           help="Outcome = mean over days t+lag … t+lag+window-1. "
+                                "Lag 1 + window 2 answers 'within the next 48h'.")
+
+if len(date_range) != 2:
+    st.warning("⚠️ Please select a valid start and end date.")
+    st.stop()
+
+start_date, end_date = date_range
+x_idx, y_idx = fm.feature_index(x_feature), fm.feature_index(y_feature)
+
+st.markdown(f"**Date Range:** {start_date} to {end_date}")
+st.markdown(f"**Players:** {len(fm.players)} • **Question:** does *{x_feature}* on day t relate to "
+            f"*{y_feature}* over the following {window} day(s)?")
+
+# ===============================
+# 🔗 Correlación con desfase
+# ===============================
+st.subheader("🔗 Lagged Correlation (all players)")
+
+r, n = analytics.lagged_correlations(fm, max_lag, window, start_date, end_date)
+lag_df = pd.DataFrame({
+    "Lag (days)": np.arange(max_lag + 1),
+    "r": r[:, x_idx, y_idx],
+    "Pairs": n[:, x_idx, y_idx].astype(int),
+})
+
+fig = go.Figure(go.Bar(
+    x=lag_df["Lag (days)"], y=lag_df["r"],
+    text=[f"{val:.2f}" if not pd.isna(val) else "" for val in lag_df["r"]],
+    customdata=lag_df["Pairs"],
+    hovertemplate="Lag %{x}d<br>r = %{y:.3f}<br>Pairs: %{customdata}<extra></extra>",
+    marker_color=["rgba(255,0,0,0.5)" if val < 0 else "rgba(0,128,0,0.5)" for val in lag_df["r"].fillna(0)],
+))
+fig.update_layout(
+    xaxis=dict(title="Lag (days)", dtick=1),
+    yaxis=dict(title="Pearson r", range=[-1, 1]),
+    height=350,
+    margin=dict(t=30, b=30),
+    plot_bgcolor="white"
+)
+st.plotly_chart(fig, use_container_width=True, config={"displaylogo": False})
+st.caption(f"Pairs = player-days with both values. Correlations with fewer than {analytics.MIN_PAIRS} pairs are hidden.")
+
+# ===============================
+# 🧮 Matriz de correlaciones
+# ===============================
+st.subheader("🧮 Correlation Matrix")
+lag = st.slider("Lag for matrix and per-player view (days)", 0, max_lag, 1)
+
+matrix = pd.DataFrame(r[lag], index=fm.features, columns=fm.features)
+fig_matrix = px.imshow(
+    matrix, zmin=-1, zmax=1, color_continuous_scale="RdBu", text_auto=".2f",
+    labels=dict(x=f"Outcome (t+{lag}, {window}d window)", y="Predictor (t)", color="r"),
+    aspect="auto",
+)
+fig_matrix.update_layout(height=550, margin=dict(t=30, b=30))
+st.plotly_chart(fig_matrix, use_container_width=True, config={"displaylogo": False})
+
+# ===============================
+# 👤 Resumen por jugador
+# ===============================
+st.subheader("👤 Per-Player Summary")
+
+player_r, player_n = analytics.player_correlations(fm, lag, window, start_date, end_date)
+summary = analytics.player_summary(fm, start_date, end_date).copy()
+summary[f"r ({x_feature} → {y_feature})"] = player_r[:, x_idx, y_idx]
+summary["Pairs"] = player_n[:, x_idx, y_idx].astype(int)
+
+st.dataframe(summary.round(2), use_container_width=True)
+st.caption("Means over the date range; Procedures and Workouts are totals.")
@@ -5,18 +5,18 @@ from matplotlib.patches import FancyBboxPatch
 from matplotlib.lines import Line2D
 import datetime
 
+import data_api
+from components import current_squad, paged_table
+
 st.set_page_config(layout="wide",page_icon="📅")
 
-@st.cache_data(ttl=600)
+# Plantilla activa (elegida en el Hub)
+squad = current_squad()
+st.sidebar.caption(f"👥 Squad: {squad}")
+
+# Datos limpios compartidos (ver data_api.py)
 def load_calendar_data():
-    url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSMsjTKKdu36YrJAL2IVFuXVhBBHSMx99DJPUp1CGq7RufXf2dNRlATMqa8gLWb1VZJ2kWZgO82TNVa/pub?gid=1443408897&single=true&output=csv"
-    df = pd.read_csv(url)
-    df["Date"] = pd.to_datetime(df["Date"], dayfirst=True, errors="coerce").dt.date
-    df.dropna(subset=["Date"], inplace=True)
-    df["Player"] = df["Player"].astype(str).str.split(", ")
-    df = df.explode("Player")
-    df["Workout"] = df["Workout"].str.strip()
-    return df
+    return data_api.get_snapshot("calendar", squad)
 
 df = load_calendar_data()
 
@@ -44,7 +44,7 @@ st.markdown(
 
 # Botón para refrescar datos
 if st.button("🔄 Refresh Data"):
-    st.cache_data.clear()
+    data_api.refresh("calendar", squad=squad)
 
 if len(date_range) != 2:
     st.warning("⚠️ Please select a valid start and end date.")
@@ -163,4 +163,4 @@ else:
         # Tabla de detalles
         st.subheader("📋 Activity Details")
         df_details = df_filtered[["Date", "Player", "Details"]].dropna().sort_values(by="Date")
-        st.dataframe(df_details.reset_index(drop=True), use_container_width=True)
\ No newline at end of file
+        paged_table(df_details, key="calendar_details")
\ No newline at end of file
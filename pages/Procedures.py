@@ -3,8 +3,16 @@ import pandas as pd
 import datetime as dt
 import plotly.express as px
 
+import data_api
+from body_regions import draw_body_map, parse_pain, select_pain, severity_colors
+from components import current_squad, paged_table
+
 st.set_page_config(layout="wide",page_icon="💆‍♂️")
 
+# Plantilla activa (elegida en el Hub)
+squad = current_squad()
+st.sidebar.caption(f"👥 Squad: {squad}")
+
 # Logo y titulo
 st.markdown(
     """
@@ -21,20 +29,11 @@ st.markdown(
 
 # Botón para refrescar datos
 if st.button("🔄 Refresh Data"):
-    st.cache_data.clear()
+    data_api.refresh("procedures", squad=squad)
 
-# Cargar datos desde Google Sheets
-@st.cache_data(ttl=300)
+# Datos limpios compartidos (ver data_api.py)
 def load_data():
-    url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRwKKzVCkFoANZQkD0r27jCIYG9JHGpgSBwnJ3g_R3Ah7E4EfdJf7qjAHlFT2eySz_TTYQ3bqHD5agQ/pub?gid=928266016&single=true&output=csv"
-    df = pd.read_csv(url)
-    df.columns = [col.strip() for col in df.columns]
-    df["DATE"] = pd.to_datetime(df["DATE"], dayfirst=True, errors="coerce").dt.date  # ✅ Corrección aquí
-    df = df.dropna(subset=["DATE"])
-    df["PLAYER"] = df["PLAYER"].astype(str)
-    return df
-
-
+    return data_api.get_snapshot("procedures", squad)
 
 
 df = load_data()
@@ -95,57 +94,25 @@ else:
         # 📝 Tabla de razones con responsable
         st.subheader("📝 Reasons for Procedures")
         why_table = df_range[["DATE", "PLAYER", "Why?", "REGISTERED BY:"]].dropna(subset=["Why?"]).reset_index(drop=True)
-        st.dataframe(why_table)
+        paged_table(why_table, key="procedures_why")
 
 
 # ================================
-# 🧍 Treated Body Areas (Dual View)
+# 🧍 Treated Body Areas vs. Self-Reported Pain
 # ================================
-st.subheader("🧍 Treated Body Areas (Beta)")
-
-from PIL import Image
-import matplotlib.pyplot as plt
-
-# Diccionario de coordenadas ajustado (2 cm ≈ +25 px de desplazamiento horizontal)
-region_coords = {
-    # Vista trasera (izquierda)
-    "Right Adductor": (115, 270),
-    "Left Adductor": (90, 270),
-    "Right biceps femoris": (120, 300),
-    "Left biceps femoris": (70, 300),
-    "Lower back": (95, 215),
-
-    # Vista frontal (derecha)
-    "Abdomen": (308, 210),
-    "Left Knee": (325, 335),
-    "Right anterior rectum": (290, 275),
-    "Left anterior rectum": (318, 275),
-    "Right ankle": (290, 430),
-    "Left ankle": (320, 430),
-}
-
-
-# Contar tratamientos por región en el rango de fechas filtrado
-region_counts = df_range["PLACE"].dropna().value_counts()
-
-# Cargar imagen base
-body_img = Image.open("assets/body_map.png")
-
-fig, ax = plt.subplots(figsize=(4, 6))
-ax.imshow(body_img)
-ax.axis("off")
-
-# Normalizar tamaño del círculo
-max_count = region_counts.max() if not region_counts.empty else 1
-
-# Pintar solo regiones con conteo > 0
-for region, count in region_counts.items():
-    if region in region_coords:
-        x, y = region_coords[region]
-        size = 80 + 200 * (count / max_count)  # Mucho más pequeño
-        ax.scatter(x, y, s=size, c="red", alpha=0.5, edgecolors="black", linewidths=0.5)
-        ax.text(x, y, str(count), fontsize=6, ha="center", va="center", color="white", weight="bold")
-        ax.text(x, y + 12, region, fontsize=5.5, ha="center", va="top", color="black")
-
-st.pyplot(fig)
-
+st.subheader("🧍 Treated Body Areas vs. Self-Reported Pain (Beta)")
+
+if len(date_range) == 2:
+    col_treated, col_pain = st.columns(2)
+
+    with col_treated:
+        st.caption("Treated areas (procedures)")
+        # Contar tratamientos por región en el rango de fechas filtrado
+        region_counts = df_range["PLACE"].dropna().value_counts()
+        st.pyplot(draw_body_map(region_counts))
+
+    with col_pain:
+        st.caption("Self-reported muscle discomfort (wellness) – 🟡 L / 🟠 M / 🔴 H")
+        pain = data_api.derived("wellness", parse_pain, squad=squad)
+        pain_range = select_pain(pain, date_range[0], date_range[1], selected_player)
+        st.pyplot(draw_body_map(pain_range["Region"].value_counts(), severity_colors(pain_range)))
@@ -3,8 +3,16 @@ import pandas as pd
 import datetime
 import plotly.graph_objects as go
 
+import data_api
+from body_composition import FAT_THRESHOLD, summarize
+from components import current_squad, paged_table
+
 st.set_page_config(layout="wide",page_icon="⚖️")
 
+# Plantilla activa (elegida en el Hub)
+squad = current_squad()
+st.sidebar.caption(f"👥 Squad: {squad}")
+
 # Encabezado
 st.markdown("""
     <div style="display: flex; align-items: center; margin-bottom: 10px;">
@@ -17,51 +25,18 @@ st.markdown("""
 
 # Botón para refrescar
 if st.button("🔄 Refresh Data"):
-    st.cache_data.clear()
+    data_api.refresh("weight_fat", squad=squad)
 
 # ===============================
 # Cargar y preparar datos
 # ===============================
-@st.cache_data(ttl=600)
 def load_data():
-    # Peso
-    url_weight = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTJAPNxMxap3A9olCNHFJnTTLrXGVXVk5VA8_mAKQEf8edOwGH8-BSIKPysPrlqtA/pub?gid=1228753850&single=true&output=csv"
-    weight_df = pd.read_csv(url_weight)
-    weight_df.columns = [col.strip() for col in weight_df.columns]
-    weight_df = weight_df.rename(columns={"Player_name": "Player", "Date": "Date", "Weight": "Weight"})
-    weight_df["Date"] = pd.to_datetime(weight_df["Date"], dayfirst=True, errors="coerce").dt.date
-    weight_df["Weight"] = (
-        weight_df["Weight"]
-        .astype(str)
-        .str.replace(",", ".", regex=False)
-        .str.extract(r'(\d+\.?\d*)')[0]
-        .astype(float)
-    )
-
-    # Grasa
-    url_fat = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQLnDatT5HZr31oJe_dppWxN1VJsyUSBL-lwvyFqsmf0ERKwCzXvUH4OLYtVbLfLw/pub?gid=806789282&single=true&output=csv"
-    fat_df = pd.read_csv(url_fat)
-    fat_df.columns = [col.strip() for col in fat_df.columns]
-    fat_df = fat_df.rename(columns={"Full_Name": "Player", "Date": "Date", "Faulker": "%Fat"})
-    fat_df["Date"] = pd.to_datetime(fat_df["Date"], dayfirst=True, errors="coerce").dt.date
-    fat_df["%Fat"] = (
-        fat_df["%Fat"]
-        .astype(str)
-        .str.replace(",", ".", regex=False)
-        .str.extract(r'(\d+\.?\d*)')[0]
-        .astype(float)
-    )
-
-    # Fusionar
-    merged = pd.merge(weight_df[["Player", "Date", "Weight"]],
-                      fat_df[["Player", "Date", "%Fat"]],
-                      on=["Player", "Date"], how="outer")
-
-    merged = merged.dropna(subset=["Player", "Date"])
-    merged = merged.sort_values(by=["Player", "Date"]).reset_index(drop=True)
-    return merged
+    # Datos limpios compartidos (ver data_api.py)
+    return data_api.get_snapshot("weight_fat", squad)
 
 df = load_data()
+# Último registro, mejor % grasa y alerta por jugador (una vez por snapshot)
+summary = data_api.derived("weight_fat", summarize, squad=squad)
 
 # ===============================
 # Filtros
@@ -107,18 +82,20 @@ else:
                 yaxis="y1"
             ))
 
-            # Línea de grasa
+            # Línea de grasa: solo los días con medición real (el valor alineado puede ser de
+            # una medición posterior); connectgaps une las mediciones entre sí
+            fat = player_df["%Fat"].where(player_df["Date"] == player_df["Fat Date"])
             fig.add_trace(go.Scatter(
             x=player_df["Date"],
-            y=player_df["%Fat"],
+            y=fat,
             mode='lines+markers+text',
             name=f"{player} – % Fat",
             yaxis="y2",
-            text=[f"{val:.1f}%" if not pd.isna(val) else "" for val in player_df["%Fat"]],
+            text=[f"{val:.1f}%" if pd.notna(val) else "" for val in fat],
             textposition="top center",
             textfont=dict(size=9),
-            line=dict(dash="dot"),
-            connectgaps=True  # 🔧 Fuerza la conexión entre puntos
+            connectgaps=True,
+            line=dict(dash="dot")
         ))
 
 
@@ -148,45 +125,48 @@ else:
         # ================================
         st.subheader("🏷️ Latest Fat & Weight Record")
 
-        latest_records = df_filtered.sort_values("Date").groupby("Player", as_index=False).last()
+        latest_records = summary.reindex(selected_players)
 
         cols = st.columns(len(selected_players))
-        for i, player in enumerate(selected_players):
+        for i, (player, record) in enumerate(latest_records.iterrows()):
             with cols[i]:
-                record = latest_records[latest_records["Player"] == player]
-                if not record.empty:
-                    fat = record["%Fat"].values[0]
-                    weight = record["Weight"].values[0]
-                    fat_status = "✅" if fat <= 11.5 else "🚨"
-                    st.metric(label=f"{player}", value=f"{weight:.1f} kg / {fat:.1f}% {fat_status}")
+                weight = f"{record['Weight']:.1f} kg" if pd.notna(record["Weight"]) else "– kg"
+                if pd.notna(record["%Fat"]):
+                    fat_status = "✅" if record["%Fat"] <= FAT_THRESHOLD else "🚨"
+                    fat = f"{record['%Fat']:.1f}% {fat_status}"
                 else:
+                    fat = "–%"
+                if pd.isna(record["Weight"]) and pd.isna(record["%Fat"]):
                     st.metric(label=f"{player}", value="No data")
+                else:
+                    st.metric(label=f"{player}", value=f"{weight} / {fat}")
 
         # ================================
         # 🔖 Best % Fat per Selected Player
         # ================================
         st.subheader("🔖 Best % Fat per Player")
-        fat_data = df[df["%Fat"].notna()]
-        selected_data = fat_data[fat_data["Player"].isin(selected_players)]
-        best_fat = selected_data.groupby("Player")["%Fat"].min().reset_index()
+        best_fat = summary["Best %Fat"].reindex(selected_players).dropna()
 
-        cols = st.columns(len(best_fat))
-        for i, row in best_fat.iterrows():
-            with cols[i]:
-                st.metric(label=f"Best % Fat – {row['Player']}", value=f"{row['%Fat']:.2f}%")
+        if not best_fat.empty:
+            cols = st.columns(len(best_fat))
+            for i, (player, value) in enumerate(best_fat.items()):
+                with cols[i]:
+                    st.metric(label=f"Best % Fat – {player}", value=f"{value:.2f}%")
+        else:
+            st.write("No body fat measurements for the selected players.")
 
         # ===============================
         # 📋 Data Table
         # ===============================
         st.subheader("📋 Data Table")
-        st.dataframe(df_filtered.sort_values(["Player", "Date"]), use_container_width=True)
+        paged_table(df_filtered, key="weight_fat_table")
 
 # ================================
 # 🚨 Players Over 11.5% Body Fat
 # ================================
 st.subheader("🚨 Players with Body Fat > 11.5% (Latest Record)")
-latest_fat = df.dropna(subset=["%Fat"]).sort_values("Date").groupby("Player", as_index=False).last()
-over_fat = latest_fat[latest_fat["%Fat"] > 11.5]
+over_fat = summary[summary[f"Over {FAT_THRESHOLD}%"]].reset_index()
+over_fat = over_fat.rename(columns={"Date": "Weight Date", "Fat Date": "Date"})
 
 if not over_fat.empty:
     st.dataframe(over_fat[["Player", "Date", "%Fat"]].sort_values("%Fat", ascending=False), use_container_width=True)
@@ -6,27 +6,19 @@ import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 
-st.set_page_config(layout="wide",page_icon="🍃")
-
-# Función para cargar y procesar los datos
-@st.cache_data(ttl=300)
-def load_data():
-    sheet_id = "10z9TpU3nwytVqDh3LlNxMloCIC1St4FH7kbZ6Z2CmQg"
-    sheet_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-    df = pd.read_csv(sheet_url)
+import data_api
+from body_regions import draw_body_map, parse_pain, region_severity_counts, select_pain, severity_colors
+from components import current_squad, paged_table
 
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-    df = df.dropna(subset=['Timestamp'])
-    df['Date'] = df['Timestamp'].dt.date
-
-    vars_1to5 = ["FATIGUE", "SLEEP QUALITY", "MUSCLE DISCOMFORT", "MOOD"]
-    var_recovery = "HOW HAVE YOU RECOVERED?"
+st.set_page_config(layout="wide",page_icon="🍃")
 
-    for var in vars_1to5:
-        df[var] = df[var].astype(str).str.extract(r'(\d)').astype(float)
-    df[var_recovery] = pd.to_numeric(df[var_recovery], errors='coerce')
+# Plantilla activa (elegida en el Hub)
+squad = current_squad()
+st.sidebar.caption(f"👥 Squad: {squad}")
 
-    return df
+# Datos limpios compartidos (ver data_api.py)
+def load_data():
+    return data_api.get_snapshot("wellness", squad)
 
 
 # Logo y titulo
@@ -45,9 +37,11 @@ st.markdown(
 
 # Botón para refrescar los datos
 if st.button("🔄 Refresh Data"):
-    st.cache_data.clear()
+    data_api.refresh("wellness", squad=squad)
 
 df = load_data()
+# Molestias musculares ya parseadas: índice (Name, Date) con región y severidad
+pain = data_api.derived("wellness", parse_pain, squad=squad)
 
 tab1, tab2 = st.tabs(["📊 Daily Overview", "📈 Individual Trend"])
 
@@ -124,9 +118,9 @@ with tab1:
 
         # Muscle Discomfort
         st.subheader("🦵 Muscle Discomfort Areas")
-        muscle_pain = filtered[filtered["IF THE PREVIOUS ANSWER IS 1 OR 2. WHERE (LOW = L / MEDIUM = M /HIGH = H)"].notna()]
+        muscle_pain = select_pain(pain, selected_date, selected_date)
         if not muscle_pain.empty:
-            st.dataframe(muscle_pain[["Name", "IF THE PREVIOUS ANSWER IS 1 OR 2. WHERE (LOW = L / MEDIUM = M /HIGH = H)"]])
+            st.dataframe(muscle_pain.reset_index()[["Name", "Region", "Severity"]])
         else:
             st.write("No muscle pain reported.")
 
@@ -193,22 +187,27 @@ with tab2:
 )
 
             st.subheader("🦵 Muscle Pain Area Report")
-            pain_zone = df_range[df_range["IF THE PREVIOUS ANSWER IS 1 OR 2. WHERE (LOW = L / MEDIUM = M /HIGH = H)"].notna()]
+            pain_zone = select_pain(pain, date_range[0], date_range[1], selected_player)
             if not pain_zone.empty:
-                st.dataframe(pain_zone[["Date", "Name", "IF THE PREVIOUS ANSWER IS 1 OR 2. WHERE (LOW = L / MEDIUM = M /HIGH = H)"]])
+                col_map, col_counts = st.columns(2)
+                with col_map:
+                    st.pyplot(draw_body_map(pain_zone["Region"].value_counts(), severity_colors(pain_zone)))
+                with col_counts:
+                    st.dataframe(region_severity_counts(pain_zone), use_container_width=True)
+                paged_table(pain_zone.reset_index()[["Date", "Name", "Region", "Severity", "Raw"]], key="trend_pain")
             else:
                 st.write("No muscle discomforts reported.")
 
             st.subheader("💧 Urine Color Alert (>4)")
             urine_indiv = df_range[pd.to_numeric(df_range["URINE COLOR"], errors='coerce') > 4]
             if not urine_indiv.empty:
-                st.dataframe(urine_indiv[["Date", "Name", "URINE COLOR"]])
+                paged_table(urine_indiv[["Date", "Name", "URINE COLOR"]], key="trend_urine")
             else:
                 st.write("No urine alerts in this period.")
 
             st.subheader("😴 Short Sleep Hours (-7h)")
             sleep_indiv = df_range[df_range["HOW MANY HOURS YOU SLEEP?"].isin(["1-5", "5-7"])]
             if not sleep_indiv.empty:
-                st.dataframe(sleep_indiv[["Date", "Name", "HOW MANY HOURS YOU SLEEP?"]])
+                paged_table(sleep_indiv[["Date", "Name", "HOW MANY HOURS YOU SLEEP?"]], key="trend_sleep")
             else:
                 st.write("No short sleep entries.")
\ No newline at end of file
@@ -0,0 +1,143 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+from body_composition import align_weight_fat
+from body_regions import PAIN_COL, parse_pain
+
+
+def D(day):
+    return datetime.date(2025, 1, day)
+
+
+def wellness_frame(rows):
+    df = pd.DataFrame(rows, columns=["Name", "Date", "FATIGUE", "HOW MANY HOURS YOU SLEEP?"])
+    for col in ["SLEEP QUALITY", "MUSCLE DISCOMFORT", "MOOD", "HOW HAVE YOU RECOVERED?"]:
+        df[col] = 3.0
+    return df
+
+
+@pytest.fixture
+def sources():
+    wellness = wellness_frame([
+        ["A", D(1), 4.0, "1-5"],
+        ["A", D(2), 2.0, "7-9"],
+        ["B", D(1), 3.0, None],
+    ])
+    procedures = pd.DataFrame({"PLAYER": ["A", "A", "nan"], "DATE": [D(2), D(2), D(3)], "PLACE": ["x", "y", "z"]})
+    calendar = pd.DataFrame({"Player": ["B", "nan"], "Date": [D(3), D(3)], "Workout": ["Gym", "Gym"]})
+    weight = pd.DataFrame({"Player": ["A", "A", "A"], "Date": [D(1), D(3), D(5)], "Weight": [80.0, 81.0, 82.0]})
+    fat = pd.DataFrame({"Player": ["A"], "Date": [D(4)], "%Fat": [11.0]})
+    return wellness, procedures, calendar, align_weight_fat(weight, fat)
+
+
+def test_build_matrix_shape_and_values(sources):
+    fm = analytics.build_matrix(*sources)
+    assert fm.players == ["A", "B"]
+    assert fm.values.shape == (2, 5, len(analytics.FEATURES))
+
+    a = fm.players.index("A")
+    assert fm.values[a, 0, fm.feature_index("FATIGUE")] == 4.0
+    assert fm.values[a, 0, fm.feature_index("Short sleep")] == 1.0
+    assert fm.values[a, 1, fm.feature_index("Short sleep")] == 0.0
+    assert fm.values[a, 1, fm.feature_index("Procedures")] == 2.0
+    assert fm.values[a, 4, fm.feature_index("Procedures")] == 0.0
+    assert np.isnan(fm.values[fm.players.index("B"), 0, fm.feature_index("Short sleep")])
+
+
+def test_blank_players_are_dropped(sources):
+    fm = analytics.build_matrix(*sources)
+    assert "nan" not in fm.players
+    assert fm.values[:, 2, fm.feature_index("Workouts")].sum() == 1.0
+
+
+def test_fat_only_on_measurement_days(sources):
+    fm = analytics.build_matrix(*sources)
+    a, fat = fm.players.index("A"), fm.feature_index("%Fat")
+    # La grasa medida el día 4 no se copia a los pesos de los días 1, 3 y 5
+    assert np.isnan(fm.values[a, [0, 2, 4], fat]).all()
+    assert fm.values[a, 3, fat] == 11.0
+    assert fm.values[a, 4, fm.feature_index("Weight")] == 82.0
+
+
+def test_window_mean_ignores_nan():
+    values = np.array([[1.0, np.nan, 3.0, 5.0]])[:, :, None]
+    means = analytics._window_mean(values, 2)[0, :, 0]
+    np.testing.assert_allclose(means, [1.0, 3.0, 4.0])
+
+
+def random_matrix(players=4, days=60, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(players, days, len(analytics.FEATURES)))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    return analytics.FeatureMatrix(values, [f"P{i}" for i in range(players)],
+                                   pd.date_range("2025-01-01", periods=days), list(analytics.FEATURES))
+
+
+def test_lag_zero_matches_pandas_pairwise_corr():
+    fm = random_matrix()
+    r, n = analytics.lagged_correlations(fm, 0)
+    expected = pd.DataFrame(fm.values.reshape(-1, len(fm.features))).corr(min_periods=analytics.MIN_PAIRS)
+    np.testing.assert_allclose(r[0], expected.to_numpy(), atol=1e-10)
+
+
+def test_lagged_window_matches_shifted_pandas():
+    fm = random_matrix()
+    lag, window = 1, 2
+    r, n = analytics.lagged_correlations(fm, 3, window)
+
+    x_idx, y_idx = 0, 1
+    xs, ys = [], []
+    for p in range(len(fm.players)):
+        x = pd.Series(fm.values[p, :, x_idx])
+        y = pd.Series(fm.values[p, :, y_idx])
+        # Media de Y en [t + lag, t + lag + window)
+        y_future = y.rolling(window, min_periods=1).mean().shift(-(lag + window - 1))
+        xs.append(x)
+        ys.append(y_future)
+    x, y = pd.concat(xs, ignore_index=True), pd.concat(ys, ignore_index=True)
+    assert r[lag, x_idx, y_idx] == pytest.approx(x.corr(y))
+    assert n[lag, x_idx, y_idx] == (x.notna() & y.notna()).sum()
+
+
+def test_results_are_cached_on_matrix():
+    fm = random_matrix()
+    first = analytics.lagged_correlations(fm, 2, 1)
+    assert analytics.lagged_correlations(fm, 2, 1) is first
+
+
+def test_player_correlations_match_pandas():
+    fm = random_matrix()
+    r, _ = analytics.player_correlations(fm, 0)
+    expected = pd.DataFrame(fm.values[2]).corr(min_periods=analytics.MIN_PAIRS).to_numpy()
+    np.testing.assert_allclose(r[2], expected, atol=1e-10)
+
+
+def test_too_few_pairs_gives_nan():
+    fm = random_matrix(players=1, days=5)
+    r, n = analytics.lagged_correlations(fm, 0)
+    assert np.isnan(r).all()
+
+
+def test_player_summary_totals_counts(sources):
+    fm = analytics.build_matrix(*sources)
+    summary = analytics.player_summary(fm)
+    assert summary.loc["A", "Procedures"] == 2.0
+    assert summary.loc["A", "FATIGUE"] == 3.0
+    assert summary.loc["B", "Workouts"] == 1.0
+
+
+def test_blank_player_pain_answers_are_dropped(sources):
+    pain = parse_pain(pd.DataFrame({
+        "Name": ["", None, "A"],
+        "Date": [D(2), D(9), D(2)],
+        PAIN_COL: ["knee L", "knee L", "Right ankle M"],
+    }))
+    fm = analytics.build_matrix(*sources, pain=pain)
+    pain_idx = fm.feature_index("Pain areas")
+    assert fm.values.shape[1] == 5
+    assert fm.values[fm.players.index("A"), 1, pain_idx] == 1.0
+    assert np.isnan(fm.values[fm.players.index("B"), 1, pain_idx])
@@ -0,0 +1,79 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from body_composition import align_weight_fat, summarize
+
+
+def D(day):
+    return datetime.date(2025, 1, day)
+
+
+@pytest.fixture
+def weight():
+    return pd.DataFrame({
+        "Player": ["A", "A", "A", "A", "B"],
+        "Date": [D(1), D(3), D(20), D(28), D(2)],
+        "Weight": [80.0, 80.5, 79.0, 78.0, 70.0],
+    })
+
+
+@pytest.fixture
+def fat():
+    return pd.DataFrame({
+        "Player": ["A", "A", "C"],
+        "Date": [D(4), D(27), D(1)],
+        "%Fat": [12.0, 10.5, 9.0],
+    })
+
+
+def test_align_uses_nearest_fat_measurement(weight, fat):
+    aligned = align_weight_fat(weight, fat).set_index(["Player", "Date"])
+    assert aligned.loc[("A", D(3)), "%Fat"] == 12.0
+    assert aligned.loc[("A", D(3)), "Fat Date"] == D(4)
+    assert aligned.loc[("A", D(28)), "Fat Date"] == D(27)
+
+
+def test_align_keeps_fat_only_dates_and_players(weight, fat):
+    aligned = align_weight_fat(weight, fat).set_index(["Player", "Date"])
+    assert pd.isna(aligned.loc[("A", D(4)), "Weight"])
+    assert aligned.loc[("C", D(1)), "%Fat"] == 9.0
+
+
+def test_align_respects_tolerance(weight, fat):
+    aligned = align_weight_fat(weight, fat).set_index(["Player", "Date"])
+    # B no tiene ninguna medición de grasa
+    assert pd.isna(aligned.loc[("B", D(2)), "%Fat"])
+
+
+def test_summarize_latest_and_best(weight, fat):
+    summary = summarize(align_weight_fat(weight, fat))
+    assert summary.loc["A", "Weight"] == 78.0
+    assert summary.loc["A", "Date"] == D(28)
+    assert summary.loc["A", "%Fat"] == 10.5
+    assert summary.loc["A", "Best %Fat"] == 10.5
+    assert not summary.loc["A", "Over 11.5%"]
+    assert pd.isna(summary.loc["B", "Best %Fat"])
+
+
+def test_same_day_fat_readings_are_averaged_not_dropped(weight):
+    fat = pd.DataFrame({
+        "Player": ["A", "A", "A"],
+        "Date": [D(9), D(9), D(27)],
+        "%Fat": [10.0, 12.0, 11.8],
+    })
+    aligned = align_weight_fat(weight, fat)
+    assert len(aligned[(aligned["Player"] == "A") & (aligned["Date"] == D(9))]) == 1
+
+    summary = summarize(aligned)
+    assert summary.loc["A", "Best %Fat"] == 11.0
+    assert summary.loc["A", "%Fat"] == 11.8
+    assert summary.loc["A", "Over 11.5%"]
+
+
+def test_same_day_readings_do_not_trigger_false_alert(weight):
+    fat = pd.DataFrame({"Player": ["A", "A"], "Date": [D(9), D(9)], "%Fat": [10.0, 12.0]})
+    summary = summarize(align_weight_fat(weight, fat))
+    assert summary.loc["A", "Best %Fat"] == 11.0
+    assert not summary.loc["A", "Over 11.5%"]
@@ -0,0 +1,103 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from body_regions import PAIN_COL, SEVERITY_COLORS, parse_pain, region_severity_counts, select_pain, severity_colors
+
+
+def D(day):
+    return datetime.date(2025, 1, day)
+
+
+def parse(*answers):
+    df = pd.DataFrame({
+        "Name": [f"P{i}" for i in range(len(answers))],
+        "Date": [D(1)] * len(answers),
+        PAIN_COL: list(answers),
+    })
+    return parse_pain(df).reset_index()
+
+
+@pytest.mark.parametrize("answer, region, severity", [
+    ("Right adductor H", "Right Adductor", "H"),
+    ("adductor right - M", "Right Adductor", "M"),
+    ("hamstring left (L)", "Left biceps femoris", "L"),
+    ("H left knee", "Left Knee", "H"),
+    ("Lower back medium", "Lower back", "M"),
+    ("Quads right high", "Right anterior rectum", "H"),
+    ("low back", "Lower back", "?"),
+    ("Low back H", "Lower back", "H"),
+    ("L adductor", "Left Adductor", "?"),
+    ("l ankle", "Left ankle", "?"),
+    ("left knee L", "Left Knee", "L"),
+])
+def test_single_region(answer, region, severity):
+    parsed = parse(answer).fillna({"Severity": "?"})
+    assert parsed[["Region", "Severity"]].values.tolist() == [[region, severity]]
+    assert parsed["Mapped"].all()
+
+
+def test_last_severity_token_wins_and_leading_letter_is_side():
+    parsed = parse("L hamstring M")
+    assert parsed[["Region", "Severity"]].values.tolist() == [["Left biceps femoris", "M"]]
+
+
+def test_leading_r_is_right_side():
+    parsed = parse("R adductor H")
+    assert parsed[["Region", "Severity", "Mapped"]].values.tolist() == [["Right Adductor", "H", True]]
+
+
+def test_split_is_case_insensitive():
+    parsed = parse("Hamstring AND knee M")
+    assert parsed["Region"].tolist() == ["Biceps femoris", "Knee"]
+    assert parsed["Severity"].tolist()[1] == "M"
+
+
+def test_several_regions_in_one_answer():
+    parsed = parse("Right adductor H, lower back - M; abs low")
+    assert parsed["Region"].tolist() == ["Right Adductor", "Lower back", "Abdomen"]
+    assert parsed["Severity"].tolist() == ["H", "M", "L"]
+
+
+def test_unknown_region_is_kept_but_not_mapped():
+    parsed = parse("neck M")
+    assert parsed[["Region", "Mapped"]].values.tolist() == [["Neck", False]]
+
+
+def test_empty_answers_are_ignored():
+    df = pd.DataFrame({"Name": ["A", "B"], "Date": [D(1), D(1)], PAIN_COL: [None, "Right ankle L"]})
+    pain = parse_pain(df)
+    assert pain.index.tolist() == [("B", D(1))]
+
+
+def test_select_and_counts():
+    df = pd.DataFrame({
+        "Name": ["A", "A", "B"],
+        "Date": [D(1), D(5), D(3)],
+        PAIN_COL: ["Right ankle L", "Right ankle H, abs M", "Right ankle L"],
+    })
+    pain = parse_pain(df)
+    assert len(select_pain(pain, D(2), D(5))) == 3
+    assert len(select_pain(pain, D(1), D(5), "A")) == 3
+    assert select_pain(pain, D(1), D(5), "Z").empty
+
+    counts = region_severity_counts(pain)
+    assert counts.columns.tolist() == ["?", "L", "M", "H"]
+    assert counts.loc["Right ankle"].tolist() == [0, 2, 0, 1]
+
+
+def test_missing_severity_is_counted_and_not_shown_as_high():
+    df = pd.DataFrame({
+        "Name": ["A", "B", "C"],
+        "Date": [D(1)] * 3,
+        PAIN_COL: ["Left knee", "hamstring", "Right ankle L, right ankle"],
+    })
+    pain = parse_pain(df)
+    counts = region_severity_counts(pain)
+    assert counts.loc["Left Knee"].tolist() == [1, 0, 0, 0]
+    assert counts.sum(axis=1).to_dict() == pain["Region"].value_counts().to_dict()
+
+    colors = severity_colors(pain)
+    assert colors["Left Knee"] == SEVERITY_COLORS["?"] != SEVERITY_COLORS["H"]
+    assert colors["Right ankle"] == SEVERITY_COLORS["L"]
@@ -0,0 +1,52 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from components import DEFAULT_ORDER, search_and_sort
+
+
+@pytest.fixture
+def df():
+    # Índice repetido, como tras el explode del calendario
+    return pd.DataFrame({
+        "Date": [datetime.date(2025, 1, d) for d in (3, 1, 2, 5)],
+        "Name": ["Ana", "bob", "Carl", "ANA"],
+        "Details": ["gym", None, "Pool", "bike"],
+        "Count": [2, np.nan, 1, 3],
+    }, index=[0, 0, 1, 1])
+
+
+def rows(view, order):
+    return view.iloc[order]["Name"].tolist()
+
+
+def test_default_order_keeps_input_order(df):
+    assert rows(*search_and_sort(df)) == ["Ana", "bob", "Carl", "ANA"]
+    assert rows(*search_and_sort(df, descending=True)) == ["ANA", "Carl", "bob", "Ana"]
+
+
+def test_sort_by_column_with_duplicate_index(df):
+    assert rows(*search_and_sort(df, sort_col="Date")) == ["bob", "Carl", "Ana", "ANA"]
+    assert rows(*search_and_sort(df, sort_col="Date", descending=True)) == ["ANA", "Ana", "Carl", "bob"]
+
+
+def test_missing_values_sort_last(df):
+    assert rows(*search_and_sort(df, sort_col="Count"))[-1] == "bob"
+    assert rows(*search_and_sort(df, sort_col="Count", descending=True))[-1] == "bob"
+
+
+def test_search_is_case_insensitive_over_text_columns(df):
+    view, order = search_and_sort(df, search="ana")
+    assert rows(view, order) == ["Ana", "ANA"]
+    assert rows(*search_and_sort(df, search="POOL")) == ["Carl"]
+
+
+def test_search_then_sort(df):
+    assert rows(*search_and_sort(df, search="ana", sort_col="Count", descending=True)) == ["ANA", "Ana"]
+
+
+def test_search_without_matches(df):
+    view, order = search_and_sort(df, search="zzz")
+    assert view.empty and len(order) == 0
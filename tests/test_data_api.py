@@ -0,0 +1,125 @@
+import datetime
+import json
+import socket
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import data_api
+
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    # Fuente "wellness" falsa con reloj controlado y contador de descargas
+    clock = {"now": 1000.0}
+    loads = []
+
+    def load(files):
+        loads.append(files)
+        return pd.DataFrame({"Name": ["A"], "Date": [pd.Timestamp("2025-01-01").date()]})
+
+    monkeypatch.setattr(data_api.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setitem(data_api.SOURCES, "wellness", dict(data_api.SOURCES["wellness"], load=load, ttl=300))
+    monkeypatch.setattr(data_api, "_start_sweeper", lambda: None)
+    monkeypatch.setattr(data_api, "_snapshots", {})
+    monkeypatch.setattr(data_api, "_last_used", {})
+    monkeypatch.setattr(data_api, "_derived", {})
+    return clock, loads
+
+
+def test_snapshot_is_loaded_once_per_ttl(fake_source):
+    clock, loads = fake_source
+    first = data_api.get_snapshot("wellness")
+    clock["now"] += 200
+    assert data_api.get_snapshot("wellness") is first
+    assert len(loads) == 1
+
+    clock["now"] += 200
+    data_api.get_snapshot("wellness")
+    assert len(loads) == 2
+
+
+def test_eviction_uses_last_access_not_fetch_time(fake_source):
+    clock, _ = fake_source
+    data_api.get_snapshot("wellness")
+    key = (data_api.DEFAULT_SQUAD, "wellness")
+
+    clock["now"] += 250
+    data_api.get_snapshot("wellness")
+    clock["now"] += 250
+    data_api._evict_idle()
+    assert key in data_api._snapshots
+
+    clock["now"] += 301
+    data_api._evict_idle()
+    assert key not in data_api._snapshots
+
+
+def test_derived_is_computed_once_per_snapshot(fake_source):
+    calls = []
+
+    def count_rows(df):
+        calls.append(1)
+        return len(df)
+
+    assert data_api.derived("wellness", count_rows) == 1
+    assert data_api.derived("wellness", count_rows) == 1
+    assert len(calls) == 1
+
+    data_api.refresh("wellness")
+    data_api.derived("wellness", count_rows)
+    assert len(calls) == 2
+
+
+def test_unknown_squad_and_source():
+    with pytest.raises(KeyError):
+        data_api.get_snapshot("wellness", squad="No such squad")
+    with pytest.raises(KeyError):
+        data_api.get_snapshot("gps")
+
+
+def test_to_json_writes_plain_dates():
+    df = pd.DataFrame({
+        "Date": [datetime.date(2025, 1, 2), None],
+        "Timestamp": pd.to_datetime(["2025-01-02 08:30", "2025-01-03 09:00"]),
+        "Name": ["A", "B"],
+    })
+    records = json.loads(data_api.to_json(df))
+    assert [r["Date"] for r in records] == ["2025-01-02", None]
+    assert records[0]["Timestamp"].startswith("2025-01-02T08:30:00")
+    assert records[1]["Name"] == "B"
+
+
+@pytest.fixture
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_start_server_runs_once_and_shares_the_cache(fake_source, free_port, monkeypatch):
+    monkeypatch.setattr(data_api, "_server", None)
+    server = data_api.start_server("127.0.0.1", free_port)
+    try:
+        assert data_api.start_server("127.0.0.1", free_port) is server
+        with urllib.request.urlopen(f"http://127.0.0.1:{free_port}/wellness") as response:
+            records = json.load(response)
+        assert records == [{"Name": "A", "Date": "2025-01-01"}]
+
+        # Las páginas leen el snapshot que descargó el servicio
+        data_api.get_snapshot("wellness")
+        assert len(fake_source[1]) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_start_server_disabled_or_port_in_use(free_port, monkeypatch):
+    monkeypatch.setattr(data_api, "_server", None)
+    assert data_api.start_server("127.0.0.1", 0) is None
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", free_port))
+        sock.listen()
+        assert data_api.start_server("127.0.0.1", free_port) is None